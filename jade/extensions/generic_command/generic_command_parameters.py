@@ -1,6 +1,8 @@
 """Implements the JobParametersInterface for generic_command."""
 
+import copy
 import logging
+import sys
 from collections import namedtuple
 from pathlib import Path
 from typing import Dict, List, Optional, Set
@@ -17,11 +19,31 @@ logger = logging.getLogger(__name__)
 
 _EXTENSION = "generic_command"
 
+# These fields are excluded from serialized data when they have default values.
+_OPTIONAL_DEFAULTS = {
+    "use_multi_node_manager": False,
+    "spark_config": None,
+    "append_job_name": False,
+    "append_output_dir": False,
+    "ext": {},
+}
+
+
+def _to_job_key(name):
+    """Return the interned string form of a job name so that equal names share one object."""
+    return sys.intern(name if isinstance(name, str) else str(name))
+
 
 class GenericCommandParameters(JobParametersInterface):
     """A class used for creating a job for a generic command."""
 
     parameters_type = namedtuple("GenericCommand", "command")
+    # Fields that determine the value of the command property.
+    _COMMAND_FIELDS = frozenset(
+        ("command", "job_id", "name", "spark_config", "use_multi_node_manager")
+    )
+    _command_cache = None
+    _is_spark_job = None
 
     def __init__(self, **kwargs):
         self._model = GenericCommandParametersModel(**kwargs)
@@ -30,25 +52,41 @@ class GenericCommandParameters(JobParametersInterface):
         return "<GenericCommandParameters: {}>".format(self.name)
 
     def __getattr__(self, name):
-        if name in GenericCommandParametersModel.__fields__:
+        # Only called if normal attribute lookup fails, so the properties below bypass it.
+        if name in _FIELD_NAMES:
             return getattr(self._model, name)
         raise AttributeError(f"'GenericCommandParameters' object has no attribute '{name}'")
 
     def __setattr__(self, name, value):
         if name == "extension":
             raise AttributeError(f"'GenericCommandParameters' does not allow setting 'extension'")
-        if name in GenericCommandParametersModel.__fields__:
+        if name in _FIELD_NAMES:
+            # Model fields are stored only in the model.
             setattr(self._model, name, value)
-        self.__dict__[name] = value
+            if name in self._COMMAND_FIELDS:
+                object.__setattr__(self, "_command_cache", None)
+            if name == "spark_config":
+                object.__setattr__(self, "_is_spark_job", None)
+        else:
+            object.__setattr__(self, name, value)
 
     @property
     def command(self):
+        if self._command_cache is None:
+            object.__setattr__(self, "_command_cache", self._build_command())
+        return self._command_cache
+
+    def _build_command(self):
         if self._model.use_multi_node_manager:
             return f"jade-internal run-multi-node-job {self.name} {self._model.command}"
         elif self.is_spark_job():
             return f"jade-internal run-spark-cluster {self.name} {self._model.command}"
         return self._model.command
 
+    @property
+    def blocked_by(self):
+        return self._model.blocked_by
+
     @property
     def estimated_run_minutes(self):
         return self._model.estimated_run_minutes
@@ -61,6 +99,18 @@ class GenericCommandParameters(JobParametersInterface):
     def name(self):
         return self._create_name() if self._model.name is None else self._model.name
 
+    @property
+    def job_id(self):
+        return self._model.job_id
+
+    @property
+    def spark_config(self):
+        return self._model.spark_config
+
+    @property
+    def use_multi_node_manager(self):
+        return self._model.use_multi_node_manager
+
     def _create_name(self):
         return str(self._model.job_id)
 
@@ -73,6 +123,18 @@ class GenericCommandParameters(JobParametersInterface):
     def deserialize(cls, data):
         return cls(**data)
 
+    @classmethod
+    def deserialize_trusted(cls, data):
+        if data.get("spark_config") is not None:
+            # construct() does not create nested models.
+            return cls.deserialize(data)
+
+        values = dict(data)
+        values["blocked_by"] = {_to_job_key(x) for x in values.get("blocked_by", ())}
+        job = cls.__new__(cls)
+        object.__setattr__(job, "_model", GenericCommandParametersModel.construct(**values))
+        return job
+
     @property
     def cancel_on_blocking_job_failure(self):
         return self._model.cancel_on_blocking_job_failure
@@ -95,7 +157,11 @@ class GenericCommandParameters(JobParametersInterface):
         return self._model.submission_group
 
     def is_spark_job(self):
-        return self._model.spark_config is not None and self._model.spark_config.enabled
+        if self._is_spark_job is None:
+            spark_config = self._model.spark_config
+            is_spark_job = spark_config is not None and spark_config.enabled
+            object.__setattr__(self, "_is_spark_job", is_spark_job)
+        return self._is_spark_job
 
 
 class GenericCommandParametersModel(JadeBaseModel):
@@ -180,18 +246,34 @@ class GenericCommandParametersModel(JadeBaseModel):
 
     @validator("blocked_by")
     def handle_blocked_by(cls, value):
-        return {str(x) for x in value}
+        return {_to_job_key(x) for x in value}
 
     def dict(self, *args, **kwargs):
-        data = super().dict(*args, **kwargs)
         # Keep the config file smaller by skipping values that are defaults.
-        for field in (
-            "use_multi_node_manager",
-            "spark_config",
-            "append_job_name",
-            "append_output_dir",
-            "ext",
-        ):
-            if data[field] == GenericCommandParametersModel.__fields__[field].default:
-                data.pop(field)
+        if args or kwargs:
+            data = super().dict(*args, **kwargs)
+            for field, default in _OPTIONAL_DEFAULTS.items():
+                if field in data and data[field] == default:
+                    data.pop(field)
+            return data
+
+        # This is called for every job in a config, so build the output directly rather
+        # than materializing every field with pydantic and then popping the defaults.
+        data = {}
+        for field in _FIELD_ORDER:
+            value = getattr(self, field)
+            if field in _OPTIONAL_DEFAULTS:
+                if value == _OPTIONAL_DEFAULTS[field]:
+                    continue
+                if field == "spark_config":
+                    value = value.dict()
+                elif field == "ext":
+                    value = copy.deepcopy(value)
+            elif field == "blocked_by":
+                value = set(value)
+            data[field] = value
         return data
+
+
+_FIELD_ORDER = tuple(GenericCommandParametersModel.__fields__)
+_FIELD_NAMES = frozenset(_FIELD_ORDER)
@@ -1,34 +1,38 @@
 """Manages extensions registered with JADE."""
 
-import copy
 import enum
 import importlib
 import logging
 import os
 import pathlib
+import sys
+from types import MappingProxyType
 
 from jade.exceptions import InvalidParameter
 from jade.utils.utils import dump_data, load_data
 
 
-DEFAULT_REGISTRY = {
-    "extensions": [
-        {
-            "name": "generic_command",
-            "description": "Allows batching of a list of CLI commands.",
-            "job_execution_module": "jade.extensions.generic_command.generic_command_execution",
-            "job_execution_class": "GenericCommandExecution",
-            "job_configuration_module": "jade.extensions.generic_command.generic_command_configuration",
-            "job_configuration_class": "GenericCommandConfiguration",
-            "job_parameters_module": "jade.extensions.generic_command.generic_command_parameters",
-            "job_parameters_class": "GenericCommandParameters",
-            "cli_module": "jade.extensions.generic_command.cli",
-        },
-    ],
-    "logging": [
-        "jade",
-    ],
-}
+# Read-only so that it can be shared without copies. Copy values before mutating them.
+DEFAULT_REGISTRY = MappingProxyType(
+    {
+        "extensions": (
+            MappingProxyType(
+                {
+                    "name": "generic_command",
+                    "description": "Allows batching of a list of CLI commands.",
+                    "job_execution_module": "jade.extensions.generic_command.generic_command_execution",
+                    "job_execution_class": "GenericCommandExecution",
+                    "job_configuration_module": "jade.extensions.generic_command.generic_command_configuration",
+                    "job_configuration_class": "GenericCommandConfiguration",
+                    "job_parameters_module": "jade.extensions.generic_command.generic_command_parameters",
+                    "job_parameters_class": "GenericCommandParameters",
+                    "cli_module": "jade.extensions.generic_command.cli",
+                }
+            ),
+        ),
+        "logging": ("jade",),
+    }
+)
 
 
 class ExtensionClassType(enum.Enum):
@@ -40,9 +44,31 @@ class ExtensionClassType(enum.Enum):
     PARAMETERS = "param_class"
 
 
+_REQUIRED_EXTENSION_FIELDS = frozenset(DEFAULT_REGISTRY["extensions"][0])
+
+
+# Registry fields that define the module and class for each ExtensionClassType.
+_CLASS_FIELDS = {
+    ExtensionClassType.CLI: ("cli_module", None),
+    ExtensionClassType.CONFIGURATION: ("job_configuration_module", "job_configuration_class"),
+    ExtensionClassType.EXECUTION: ("job_execution_module", "job_execution_class"),
+    ExtensionClassType.PARAMETERS: ("job_parameters_module", "job_parameters_class"),
+}
+
 logger = logging.getLogger(__name__)
 
 
+def _cached_import(module_name, attr=None):
+    """Return the module or one of its attributes, skipping the import machinery if the module
+    has already been imported.
+
+    """
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    return module if attr is None else getattr(module, attr)
+
+
 class Registry:
     """Manages extensions registered with JADE."""
 
@@ -62,6 +88,10 @@ class Registry:
             self._registry_filename = registry_filename
 
         self._extensions = {}
+        # Imported classes by extension name and ExtensionClassType. These are kept out of
+        # self._extensions so that those dicts can be serialized as is.
+        self._extension_classes = {}
+        self._sorted_extensions = None  # cache for _sorted_items, reset on every mutation
         self._loggers = set()
         if not os.path.exists(self._registry_filename):
             self.reset_defaults()
@@ -73,15 +103,31 @@ class Registry:
                 self._loggers.add(package_name)
 
     def _add_extension(self, extension):
-        for field in DEFAULT_REGISTRY["extensions"][0]:
-            if field not in extension:
-                raise InvalidParameter(f"required field {field} not present")
+        # The caller must pass a dict that it does not retain. Classes are imported on first use.
+        missing = _REQUIRED_EXTENSION_FIELDS - extension.keys()
+        if missing:
+            raise InvalidParameter(f"required fields {sorted(missing)} not present")
+
+        self._extensions[extension["name"]] = extension
+        self._extension_classes[extension["name"]] = {}
+        self._sorted_extensions = None
+
+    def _sorted_items(self):
+        """Return the extensions as a tuple of (name, extension) pairs sorted by name."""
+        if self._sorted_extensions is None:
+            self._sorted_extensions = tuple(sorted(self._extensions.items()))
+        return self._sorted_extensions
 
+    def _load_extension_class(self, extension, class_type):
+        """Import the class for class_type and cache it. Returns None if the extension could
+        not be loaded and was removed.
+
+        """
+        module_field, class_field = _CLASS_FIELDS[class_type]
         try:
-            cmod = importlib.import_module(extension["job_configuration_module"])
-            emod = importlib.import_module(extension["job_execution_module"])
-            pmod = importlib.import_module(extension["job_parameters_module"])
-            cli_mod = importlib.import_module(extension["cli_module"])
+            cls = _cached_import(
+                extension[module_field], None if class_field is None else extension[class_field]
+            )
         except ImportError as exc:
             if "statsmodels" in exc.msg:
                 # Older versions of Jade installed the demo extension into the registry as
@@ -89,29 +135,27 @@ class Registry:
                 # when a user upgrades to the newer version.
                 # Remove the demo extension. The user can add it later if they want.
                 # This can be removed whenever all users have gone through an upgrade.
+                self._extensions.pop(extension["name"], None)
+                self._extension_classes.pop(extension["name"], None)
+                self._sorted_extensions = None
                 self._remove_demo_extension()
-                return
+                return None
             else:
                 raise
 
-        ext = copy.copy(extension)
-        ext[ExtensionClassType.CONFIGURATION] = getattr(cmod, extension["job_configuration_class"])
-        ext[ExtensionClassType.EXECUTION] = getattr(emod, extension["job_execution_class"])
-        ext[ExtensionClassType.PARAMETERS] = getattr(pmod, extension["job_parameters_class"])
-        ext[ExtensionClassType.CLI] = cli_mod
-
-        self._extensions[extension["name"]] = ext
+        self._extension_classes[extension["name"]][class_type] = cls
+        return cls
 
     def _check_registry_config(self, filename):
         data = load_data(filename)
         if isinstance(data, list):
             # Workaround to support the old registry format. 03/06/2020
             # It can be removed eventually.
+            # It has no format_version, so the v0.1.0 check below rewrites the file.
             new_data = {
                 "extensions": data,
-                "logging": DEFAULT_REGISTRY["logging"],
+                "logging": list(DEFAULT_REGISTRY["logging"]),
             }
-            dump_data(new_data, self.registry_filename, indent=4)
             print(
                 "\nReformatted registry. Refer to `jade extensions --help` "
                 "for instructions on adding logging for external packages.\n"
@@ -120,8 +164,7 @@ class Registry:
 
         format = data.get("format_version", "v0.1.0")
         if format == "v0.1.0":
-            self.reset_defaults()
-            data = load_data(filename)
+            data = self.reset_defaults()
             print(
                 "\nWARNING: Reformatted registry. You will need to "
                 "re-register any external extensions.\n"
@@ -134,13 +177,13 @@ class Registry:
             "logging": list(self._loggers),
             "format_version": self.FORMAT_VERSION,
         }
-        for _, extension in sorted(self._extensions.items()):
-            ext = {k: v for k, v in extension.items() if not isinstance(k, ExtensionClassType)}
-            data["extensions"].append(ext)
+        for _, extension in self._sorted_items():
+            data["extensions"].append(extension)
 
         filename = self.registry_filename
-        dump_data(data, filename, indent=4)
+        dump_data(data, filename, indent=2)
         logger.debug("Serialized data to %s", filename)
+        return data
 
     def add_logger(self, package_name):
         """Add a package name to the logging registry.
@@ -196,7 +239,13 @@ class Registry:
         if extension is None:
             raise InvalidParameter(f"{extension_name} is not registered")
 
-        return extension[class_type]
+        cls = self._extension_classes[extension_name].get(class_type)
+        if cls is None:
+            cls = self._load_extension_class(extension, class_type)
+            if cls is None:
+                raise InvalidParameter(f"{extension_name} is not registered")
+
+        return cls
 
     def is_registered(self, extension_name):
         """Check if the extension is registered"""
@@ -236,7 +285,24 @@ class Registry:
 
         """
 
-        self._add_extension(extension)
+        # Don't modify the caller's dict.
+        ext = {**extension}
+        name = ext.get("name")
+        previous = (self._extensions.get(name), self._extension_classes.get(name))
+        self._add_extension(ext)
+        # Fail now if the extension can't be imported.
+        try:
+            for class_type in ExtensionClassType:
+                if self._load_extension_class(ext, class_type) is None:
+                    break
+        except Exception:
+            # Don't leave a broken extension in memory, where it could be serialized later.
+            self._extensions.pop(name, None)
+            self._extension_classes.pop(name, None)
+            if previous[0] is not None:
+                self._extensions[name], self._extension_classes[name] = previous
+            self._sorted_extensions = None
+            raise
         self._serialize_registry()
         logger.debug("Registered extension %s", extension["name"])
 
@@ -246,21 +312,31 @@ class Registry:
         return self._registry_filename
 
     def reset_defaults(self):
-        """Reset the registry to its default values."""
+        """Reset the registry to its default values.
+
+        Returns
+        -------
+        dict
+            The data written to the registry file
+
+        """
         self._extensions.clear()
+        self._extension_classes.clear()
+        self._sorted_extensions = None
         self._loggers.clear()
+        # Update everything in memory and then write the file once.
         for extension in DEFAULT_REGISTRY["extensions"]:
-            self.register_extension(extension)
-        for package_name in DEFAULT_REGISTRY["logging"]:
-            self.add_logger(package_name)
-        self._serialize_registry()
+            self._add_extension({**extension})
+        self._loggers.update(DEFAULT_REGISTRY["logging"])
+        data = self._serialize_registry()
 
         logger.debug("Initialized registry to its defaults.")
+        return data
 
     def show_extensions(self):
         """Show the registered extensions."""
         print("JADE Extensions:")
-        for name, extension in sorted(self._extensions.items()):
+        for name, extension in self._sorted_items():
             print(f"  {name}:  {extension['description']}")
 
     def unregister_extension(self, extension_name):
@@ -275,6 +351,8 @@ class Registry:
             raise InvalidParameter(f"extension {extension_name} isn't registered")
 
         self._extensions.pop(extension_name)
+        self._extension_classes.pop(extension_name)
+        self._sorted_extensions = None
         self._serialize_registry()
 
     def register_demo_extension(self):
@@ -1,5 +1,6 @@
 """HPC management functionality"""
 
+import importlib
 import logging
 import os
 import time
@@ -7,31 +8,59 @@ import time
 from jade.enums import Status
 from jade.exceptions import InvalidParameter
 from jade.hpc.common import HpcType, HpcJobStatus
-from jade.hpc.fake_manager import FakeManager
-from jade.hpc.local_manager import LocalManager
-from jade.hpc.pbs_manager import PbsManager
-from jade.hpc.slurm_manager import SlurmManager
 from jade.models import HpcConfig
 
 
 logger = logging.getLogger(__name__)
 
+# Manager modules are imported only when their HPC type is used.
+_HPC_MANAGERS = {
+    HpcType.SLURM: ("jade.hpc.slurm_manager", "SlurmManager"),
+    HpcType.FAKE: ("jade.hpc.fake_manager", "FakeManager"),
+    HpcType.LOCAL: ("jade.hpc.local_manager", "LocalManager"),
+}
+_HPC_MANAGER_CLASSES = {}
+_MANAGER_MODULES = {
+    "FakeManager": "jade.hpc.fake_manager",
+    "LocalManager": "jade.hpc.local_manager",
+    "PbsManager": "jade.hpc.pbs_manager",
+    "SlurmManager": "jade.hpc.slurm_manager",
+}
+
+
+def __getattr__(name):
+    # Preserves access to the manager classes that this module used to import eagerly.
+    module_name = _MANAGER_MODULES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
 
 class HpcManager:
     """Manages HPC job submission and monitoring."""
 
+    # Bounds in seconds for the exponential backoff in _wait_for_completion
+    WAIT_POLL_INTERVAL_MIN = 2
+    WAIT_POLL_INTERVAL_MAX = 30
+    # Seconds for which check_statuses() output answers check_status(job_id=...) queries
+    STATUS_CACHE_TTL = 5
+
     def __init__(self, submission_groups, output):
         self._output = output
-        self._configs = {}
         self._intfs = {}
         self._hpc_type = None
+        self._statuses_cache = (0.0, None)
+        # Storage configuration cannot change during a run, so check each interface once.
+        self._storage_checked = set()
         assert submission_groups
         for name, group in submission_groups.items():
-            self._configs[name] = group.submitter_params.hpc_config
             self._intfs[name] = self.create_hpc_interface(group.submitter_params.hpc_config)
             if self._hpc_type is None:
                 self._hpc_type = group.submitter_params.hpc_config.hpc_type
 
+        self._default_intf = next(iter(self._intfs.values()))
+        # Bound once because it runs on every status poll.
+        self._check_statuses = self._default_intf.check_statuses
         logger.debug("Constructed HpcManager with output=%s", output)
 
     def _get_interface(self, submission_group_name=None):
@@ -40,7 +69,7 @@ class HpcManager:
             # We could store job IDs by group if we need to perform actions by group
             # in the future.
             # As of now we don't track IDs at all in this class.
-            return next(iter(self._intfs.values()))
+            return self._default_intf
         return self._intfs[submission_group_name]
 
     def am_i_manager(self):
@@ -69,6 +98,7 @@ class HpcManager:
         """
         intf = self._get_interface()
         ret = intf.cancel_job(job_id)
+        self.invalidate_status_cache()
         if ret == 0:
             logger.info("Successfully cancelled job ID %s", job_id)
         else:
@@ -94,6 +124,12 @@ class HpcManager:
         if (name is None and job_id is None) or (name is not None and job_id is not None):
             raise InvalidParameter("exactly one of name / job_id must be set")
 
+        if job_id is not None:
+            # The queue no longer reports jobs that have finished.
+            status = self._check_statuses_cached().get(job_id, HpcJobStatus.NONE)
+            logger.debug("job_id=%s status=%s", job_id, status)
+            return status
+
         intf = self._get_interface()
         info = intf.check_status(name=name, job_id=job_id)
         logger.debug("info=%s", info)
@@ -108,8 +144,11 @@ class HpcManager:
             key is job_id, value is HpcJobStatus
 
         """
-        intf = self._get_interface()
-        return intf.check_statuses()
+        return self._check_statuses()
+
+    def invalidate_status_cache(self):
+        """Discard cached statuses so that the next status check queries the HPC queue."""
+        self._statuses_cache = (0.0, None)
 
     def get_hpc_config(self, submission_group_name):
         """Returns the HPC interface instance.
@@ -216,7 +255,9 @@ class HpcManager:
 
         """
         intf = self._get_interface(submission_group_name)
-        intf.check_storage_configuration()
+        if submission_group_name not in self._storage_checked:
+            intf.check_storage_configuration()
+            self._storage_checked.add(submission_group_name)
 
         # TODO: enable this logic if batches have unique names.
         # info = intf.check_status(name=name)
@@ -235,6 +276,7 @@ class HpcManager:
             return 0, Status.GOOD
 
         result, job_id, err = intf.submit(filename)
+        self.invalidate_status_cache()
 
         if result == Status.GOOD:
             logger.info("job '%s' with ID=%s submitted successfully", name, job_id)
@@ -254,28 +296,43 @@ class HpcManager:
         environment.
 
         """
-        if config.hpc_type == HpcType.SLURM:
-            intf = SlurmManager(config)
-        elif config.hpc_type == HpcType.FAKE:
-            intf = FakeManager(config)
-        elif config.hpc_type == HpcType.LOCAL:
-            intf = LocalManager(config)
-        else:
-            raise ValueError("Unsupported HPC type: {}".format(config.hpc_type))
+        cls = _HPC_MANAGER_CLASSES.get(config.hpc_type)
+        if cls is None:
+            impl = _HPC_MANAGERS.get(config.hpc_type)
+            if impl is None:
+                raise ValueError("Unsupported HPC type: {}".format(config.hpc_type))
+            module_name, class_name = impl
+            cls = getattr(importlib.import_module(module_name), class_name)
+            _HPC_MANAGER_CLASSES[config.hpc_type] = cls
 
         logger.debug("HPC manager type=%s", config.hpc_type)
-        return intf
+        return cls(config)
+
+    def _check_statuses_cached(self):
+        """Return check_statuses() output, reusing a result that is less than
+        STATUS_CACHE_TTL seconds old so that all status checks share one query of the HPC
+        queue.
+
+        """
+        timestamp, statuses = self._statuses_cache
+        now = time.monotonic()
+        if statuses is None or now - timestamp >= self.STATUS_CACHE_TTL:
+            statuses = self.check_statuses()
+            self._statuses_cache = (now, statuses)
+        return statuses
 
     def _wait_for_completion(self, job_id):
         status = HpcJobStatus.UNKNOWN
-        intf = self._get_interface()
+        poll_interval = self.WAIT_POLL_INTERVAL_MIN
 
         while status not in (HpcJobStatus.COMPLETE, HpcJobStatus.NONE):
-            time.sleep(5)
-            job_info = intf.check_status(job_id=job_id)
-            logger.debug("job_info=%s", job_info)
-            if job_info.status != status:
-                logger.info("Status of job ID %s changed to %s", job_id, job_info.status)
-                status = job_info.status
+            time.sleep(poll_interval)
+            new_status = self.check_status(job_id=job_id)
+            if new_status != status:
+                logger.info("Status of job ID %s changed to %s", job_id, new_status)
+                status = new_status
+                poll_interval = self.WAIT_POLL_INTERVAL_MIN
+            else:
+                poll_interval = min(poll_interval * 2, self.WAIT_POLL_INTERVAL_MAX)
 
         logger.info("Job ID %s is complete", job_id)
@@ -2,11 +2,8 @@
 
 import abc
 import getpass
-import os
 
-from jade.exceptions import InvalidParameter
 from jade.hpc.common import HpcJobStats
-from jade.utils.utils import load_data
 
 
 class HpcManagerInterface(abc.ABC):
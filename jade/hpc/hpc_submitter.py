@@ -1,12 +1,12 @@
 """Controls submission of jobs to HPC nodes."""
 
-import copy
-import itertools
+import heapq
+import json
 import logging
 import os
 import sys
 import time
-from datetime import timedelta
+from collections import defaultdict
 from pathlib import Path
 
 from jade.enums import JobCompletionStatus, Status
@@ -22,7 +22,7 @@ from jade.hpc.common import HpcJobStatus, HpcType
 from jade.hpc.hpc_manager import HpcManager
 from jade.jobs.async_job_interface import AsyncJobInterface
 from jade.jobs.cluster import Cluster
-from jade.jobs.job_configuration import JobConfiguration
+from jade.jobs.job_configuration import ConfigSerializeOptions, JobConfiguration
 from jade.jobs.job_queue import JobQueue
 from jade.jobs.results_aggregator import ResultsAggregator
 from jade.loggers import log_event
@@ -32,7 +32,6 @@ from jade.result import Result
 from jade.utils.timing_utils import timed_debug
 from jade.utils.utils import (
     aggregate_data_from_files,
-    dump_data,
     create_script,
     ExtendedJSONEncoder,
 )
@@ -48,12 +47,22 @@ class HpcSubmitter:
     def __init__(self, config: JobConfiguration, config_file, cluster: Cluster, output):
         self._config = config
         self._submission_groups = make_submission_group_lookup(cluster.config.submission_groups)
-        self._config_file = config_file
-        self._base_config = config.serialize()
+        # Batch config files are named <config_file_stem>_batch_<index>.json.
+        config_file = str(config_file)
+        if config_file.endswith(".json"):
+            config_file = config_file[: -len(".json")]
+        self._config_file_stem = config_file
+        base_config = config.serialize(include=ConfigSerializeOptions.NO_JOB_INFO)
+        base_config[JobConfiguration.JOBS_VALIDATED_KEY] = True
+        # Every batch config file is the same except for its jobs. Encode the rest once.
+        text = json.dumps(base_config, cls=ExtendedJSONEncoder)
+        assert text.endswith("}"), text
+        self._base_config_prefix = text[:-1] + ', "jobs": '
         self._batch_index = cluster.job_status.batch_index
         self._cluster = cluster
         self._hpc_mgr = HpcManager(self._submission_groups, output)
         self._output = output
+        self._lock_file = Path(output) / self.LOCK_FILENAME
 
         # Limitation: these settings apply to all groups in aggregate.
         # This could be made more flexible if needed.
@@ -63,35 +72,55 @@ class HpcSubmitter:
             self._max_nodes = sys.maxsize
         self._poll_interval = group.submitter_params.poll_interval
         self._status_collector = HpcStatusCollector(self._hpc_mgr, self._poll_interval)
+        self._run_script_templates = {}  # submission group name to (prefix, suffix)
 
     def _create_run_script(self, config_file, filename, submission_group):
+        template = self._run_script_templates.get(submission_group.name)
+        if template is None:
+            template = self._make_run_script_template(submission_group)
+            self._run_script_templates[submission_group.name] = template
+        prefix, suffix = template
+        create_script(filename, prefix + str(config_file) + suffix)
+
+    def _make_run_script_template(self, submission_group):
+        """Return the run script text before and after the config file, which is the only
+        part that differs between batches of a submission group.
+
+        Returns
+        -------
+        tuple
+            (prefix, suffix)
+
+        """
+        params = submission_group.submitter_params
         text = ["#!/bin/bash"]
-        sing_params = submission_group.submitter_params.singularity_params
+        sing_params = params.singularity_params
         if sing_params and sing_params.enabled:
             text += sing_params.setup_commands.split("\n")
-        if submission_group.submitter_params.distributed_submitter:
+        if params.distributed_submitter:
             dsub = "--distributed-submitter"
         else:
             dsub = "--no-distributed-submitter"
-        command = f"jade-internal run-jobs {config_file} --output={self._output} {dsub}"
-        if submission_group.submitter_params.num_parallel_processes_per_node is not None:
-            command += f" --num-parallel-processes-per-node={submission_group.submitter_params.num_parallel_processes_per_node}"
-        if submission_group.submitter_params.verbose:
-            command += " --verbose"
+        options = f" --output={self._output} {dsub}"
+        if params.num_parallel_processes_per_node is not None:
+            options += (
+                f" --num-parallel-processes-per-node={params.num_parallel_processes_per_node}"
+            )
+        if params.verbose:
+            options += " --verbose"
 
-        text.append(command)
-        create_script(filename, "\n".join(text) + "\n")
+        text.append("jade-internal run-jobs ")
+        return "\n".join(text), options + "\n"
 
     def _make_async_submitter(self, jobs, submission_group, dry_run=False):
-        config = copy.copy(self._base_config)
-        config["jobs"] = jobs
         suffix = f"_batch_{self._batch_index}"
         self._batch_index += 1
-        new_config_file = str(self._config_file).replace(".json", f"{suffix}.json")
-        dump_data(config, new_config_file, cls=ExtendedJSONEncoder)
-        logger.info(
-            "Created split config file %s with %s jobs", new_config_file, len(config["jobs"])
-        )
+        new_config_file = f"{self._config_file_stem}{suffix}.json"
+        with open(new_config_file, "w") as f_out:
+            f_out.write(self._base_config_prefix)
+            f_out.write(json.dumps(jobs, cls=ExtendedJSONEncoder))
+            f_out.write("}")
+        logger.info("Created split config file %s with %s jobs", new_config_file, len(jobs))
 
         run_script = os.path.join(self._output, f"run{suffix}.sh")
         self._create_run_script(new_config_file, run_script, submission_group)
@@ -132,24 +161,37 @@ class HpcSubmitter:
         # Statuses may have changed since we last ran.
         # Persistent network errors could cause this submitter to fail.
         # Another submitter will try again later (unless this is the last submitter).
+        if hpc_submitters:
+            self._status_collector.refresh_if_stale()
         queue.process_queue()
-        completed_job_names, canceled_jobs = self._update_completed_jobs()
+        # Scan the cluster once. Checking completions may cancel some of these jobs.
+        not_submitted_jobs = list(self._cluster.iter_jobs(state=JobState.NOT_SUBMITTED))
+        completed_job_names, canceled_jobs = self._update_completed_jobs(not_submitted_jobs)
 
-        lock_file = Path(self._output) / self.LOCK_FILENAME
-        if lock_file.exists():
+        lock_file = self._lock_file
+        try:
+            # Create the file atomically so that the check cannot race with another creator.
+            os.close(os.open(lock_file, os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644))
+        except FileExistsError:
             raise Exception(
                 f"{lock_file} exists. A previous submitter crashed in an unknown state."
             )
-        lock_file.touch()
 
         # Start submitting jobs. If any unexpected exception prevents us from updating the
         # status file, leave the lock_file in place and intentionally cause a deadlock.
         try:
             blocked_jobs = []
             submitted_jobs = []
+            available_jobs_by_group = self._get_available_jobs_by_group(not_submitted_jobs)
             for group in self._cluster.config.submission_groups:
                 if not queue.is_full():
-                    self._submit_batches(queue, group, blocked_jobs, submitted_jobs)
+                    self._submit_batches(
+                        queue,
+                        group,
+                        available_jobs_by_group[group.name],
+                        blocked_jobs,
+                        submitted_jobs,
+                    )
 
             num_submissions = self._batch_index - starting_batch_index
             logger.info(
@@ -193,94 +235,106 @@ class HpcSubmitter:
                 self._batch_index,
             )
 
-    def _submit_batches(self, queue, submission_group, blocked_jobs, submitted_jobs):
+    def _submit_batches(
+        self, queue, submission_group, available_jobs, blocked_jobs, submitted_jobs
+    ):
         assert not queue.is_full()
-        num_submitted_jobs = 0
-        _submitted_jobs = []  # only exists for the check at the end
-        if (
-            not submission_group.submitter_params.time_based_batching
-            or "JADE_SKIP_SORT_BY_TIME" in os.environ
-        ):
-            available_jobs = self._get_available_jobs(submission_group)
-        else:
-            available_jobs = self._get_available_jobs_by_time(submission_group)
+        params = submission_group.submitter_params
+        if params.time_based_batching and "JADE_SKIP_SORT_BY_TIME" not in os.environ:
+            available_jobs = self._sort_available_jobs_by_time(available_jobs)
+        if params.try_add_blocked_jobs:
+            # The user may have listed blocked jobs before their blocking jobs.
+            available_jobs = self._order_by_blocking_jobs(available_jobs)
         while not queue.is_full() and available_jobs:
+            # _make_batch appends exactly the jobs that it adds to the batch.
             batch, available_jobs = self._make_batch(
-                available_jobs, submission_group, _submitted_jobs, blocked_jobs
+                available_jobs, submission_group, submitted_jobs, blocked_jobs
             )
             if batch.num_jobs > 0:
                 self._submit_batch(queue, submission_group, batch)
-                num_submitted_jobs += batch.num_jobs
 
-        assert num_submitted_jobs == len(
-            _submitted_jobs
-        ), f"{num_submitted_jobs} / {len(_submitted_jobs)}"
-        submitted_jobs.extend(_submitted_jobs)
+    def _get_available_jobs_by_group(self, not_submitted_jobs):
+        """Return the jobs that can be submitted, grouped by submission group name.
 
-    def _get_available_jobs(self, submission_group):
-        available_jobs = []
-        for job in self._cluster.iter_jobs(state=JobState.NOT_SUBMITTED):
-            jade_job = self._config.get_job(job.name)
-            if jade_job.submission_group == submission_group.name:
-                available_jobs.append(job)
-        return available_jobs
+        Parameters
+        ----------
+        not_submitted_jobs : list
+            Jobs that were in the NOT_SUBMITTED state at the start of the run.
+
+        Returns
+        -------
+        dict
+            Maps submission group name to a list of (cluster_job, jade_job) tuples.
 
-    def _get_available_jobs_by_time(self, submission_group):
-        available_jobs = {}
-        job_order = []
-        for job in self._cluster.iter_jobs(state=JobState.NOT_SUBMITTED):
+        """
+        # Look up each JADE job once here so that the batching code can reuse it.
+        available_jobs = {x: [] for x in self._submission_groups}
+        for job in not_submitted_jobs:
+            if job.state != JobState.NOT_SUBMITTED:
+                # The job was canceled.
+                continue
             jade_job = self._config.get_job(job.name)
-            if jade_job.submission_group == submission_group.name:
-                job_order.append((job.name, jade_job.estimated_run_minutes))
-                available_jobs[job.name] = job
-        job_order.sort(key=lambda x: x[1])
+            available_jobs[jade_job.submission_group].append((job, jade_job))
+        return available_jobs
 
+    @staticmethod
+    def _sort_available_jobs_by_time(available_jobs):
+        jobs = sorted(available_jobs, key=lambda x: x[1].estimated_run_minutes)
         logger.info("Sorted jobs by estimated_run_minutes.")
-        return [available_jobs[x[0]] for x in job_order]
+        return jobs
+
+    @staticmethod
+    def _order_by_blocking_jobs(available_jobs):
+        """Return available_jobs ordered so that every job comes after the available jobs
+        that block it. Otherwise, preserve the existing order.
+
+        """
+        index_by_name = {job.name: i for i, (job, _) in enumerate(available_jobs)}
+        num_blocking_jobs = [0] * len(available_jobs)
+        blocked_indexes = defaultdict(list)
+        for i, (job, _) in enumerate(available_jobs):
+            for name in job.blocked_by:
+                index = index_by_name.get(name)
+                if index is not None:
+                    num_blocking_jobs[i] += 1
+                    blocked_indexes[index].append(i)
+
+        # Kahn's algorithm, always picking the lowest index that is ready.
+        ready = [i for i, count in enumerate(num_blocking_jobs) if count == 0]
+        ordered_jobs = []
+        while ready:
+            index = heapq.heappop(ready)
+            ordered_jobs.append(available_jobs[index])
+            for blocked_index in blocked_indexes.get(index, []):
+                num_blocking_jobs[blocked_index] -= 1
+                if num_blocking_jobs[blocked_index] == 0:
+                    heapq.heappush(ready, blocked_index)
+
+        if len(ordered_jobs) < len(available_jobs):
+            # check_job_dependencies rejects cycles. Don't lose the jobs if one gets through.
+            ordered_jobs += [
+                available_jobs[i] for i, count in enumerate(num_blocking_jobs) if count > 0
+            ]
+        return ordered_jobs
 
     def _make_batch(self, available_jobs, submission_group, submitted_jobs, blocked_jobs):
-        blocked_jobs_by_name = {}
-        submitted_jobs_by_name = set()
+        # If try_add_blocked_jobs is enabled, available_jobs are ordered by blocking jobs,
+        # and so one pass finds every job that can run in this batch.
         batch = _BatchJobs(submission_group.submitter_params)
-        if submission_group.submitter_params.try_add_blocked_jobs:
-            # Allow multiple rounds in case the user listed blocked jobs before
-            # their blocking jobs in the config file.
-            max_iterations = len(available_jobs)
-        else:
-            max_iterations = 1
-        highest_index = -1
-        done = False
-        for _ in range(max_iterations):
-            for i, job in enumerate(available_jobs):
-                if i > highest_index:
-                    highest_index = i
-                if job.name in submitted_jobs_by_name:
-                    continue
-                jade_job = self._config.get_job(job.name)
-                if batch.is_job_blocked(job):
-                    blocked_jobs_by_name[job.name] = job
-                else:
-                    jade_job.set_blocking_jobs(job.blocked_by)
-                    if batch.try_append(jade_job):
-                        submitted_jobs.append(job)
-                        submitted_jobs_by_name.add(job.name)
-                        blocked_jobs_by_name.pop(job.name, None)
-                    else:
-                        # Need to look at this job in the next round.
-                        highest_index -= 1
-                if batch.is_ready_to_submit or len(submitted_jobs_by_name) == len(available_jobs):
-                    done = True
-                    break
-            if done:
-                break
-
-        for job in blocked_jobs_by_name.values():
-            blocked_jobs.append(job)
-        if highest_index == len(available_jobs) - 1:
-            not_checked = []
-        else:
-            not_checked = available_jobs[highest_index + 1 :]
-        return batch, not_checked
+        for i, (job, jade_job) in enumerate(available_jobs):
+            # Most jobs are not blocked. Skip the method call for them.
+            if job.blocked_by and batch.is_job_blocked(job):
+                blocked_jobs.append(job)
+            else:
+                jade_job.set_blocking_jobs(job.blocked_by)
+                if not batch.try_append(jade_job):
+                    # Look at this job again in the next batch.
+                    return batch, available_jobs[i:]
+                submitted_jobs.append(job)
+            if batch.is_ready_to_submit:
+                return batch, available_jobs[i + 1 :]
+
+        return batch, []
 
     def _submit_batch(self, queue, submission_group, batch):
         async_submitter = self._make_async_submitter(
@@ -303,13 +357,14 @@ class HpcSubmitter:
         return is_complete
 
     def _log_submission_event(self, submission_group, batch):
+        params = submission_group.submitter_params
         event = StructuredLogEvent(
-            source=submission_group.submitter_params.hpc_config.job_prefix,
+            source=params.hpc_config.job_prefix,
             category=EVENT_CATEGORY_HPC,
             name=EVENT_NAME_HPC_SUBMIT,
             message="Submitted HPC batch",
             batch_size=batch.num_jobs,
-            per_node_batch_size=submission_group.submitter_params.per_node_batch_size,
+            per_node_batch_size=params.per_node_batch_size,
         )
         log_event(event)
 
@@ -321,37 +376,42 @@ class HpcSubmitter:
         logger.info("Canceled job %s because one of its blocking jobs failed.", job.name)
         return result
 
-    def _update_completed_jobs(self):
+    def _update_completed_jobs(self, not_submitted_jobs):
         newly_completed = set()
+        failed_jobs = set()
         canceled_jobs = []
-        # If jobs fail and are configured to cancel blocked jobs, we may need to run this
-        # loop many times to cancel the entire chain.
         aggregator = ResultsAggregator.load(self._output)
-        need_to_rerun = True
-        new_results = []
-        while need_to_rerun:
-            need_to_rerun = False
-            failed_jobs = set()
-            for result in itertools.chain(aggregator.process_results(), new_results):
+        new_results = aggregator.process_results()
+        # Index the blocked jobs by their blocking jobs so that each result only visits the
+        # jobs that it blocks.
+        blocked_jobs_by_blocking_job = defaultdict(list)
+        for job in not_submitted_jobs:
+            for name in job.blocked_by:
+                blocked_jobs_by_blocking_job[name].append(job)
+
+        # If jobs fail and are configured to cancel blocked jobs, we may need to run this
+        # loop many times to cancel the entire chain. Each round only considers the results
+        # from the previous round.
+        while new_results:
+            results = new_results
+            new_results = []
+            for result in results:
                 newly_completed.add(result.name)
-                if result.return_code != 0:
+                failed = result.return_code != 0
+                if failed:
                     failed_jobs.add(result.name)
-            new_results.clear()
-
-            logger.debug("Detected completion of jobs: %s", newly_completed)
-            logger.debug("Detected failed jobs: %s", failed_jobs)
-            for job in self._cluster.iter_jobs(state=JobState.NOT_SUBMITTED):
-                if job.blocked_by:
-                    if job.cancel_on_blocking_job_failure and job.blocked_by.intersection(
-                        failed_jobs
-                    ):
-                        result = self._cancel_job(job, aggregator)
+                for job in blocked_jobs_by_blocking_job.pop(result.name, []):
+                    if job.state != JobState.NOT_SUBMITTED:
+                        # An earlier result canceled the job.
+                        continue
+                    if failed and job.cancel_on_blocking_job_failure:
+                        new_results.append(self._cancel_job(job, aggregator))
                         canceled_jobs.append(job)
-                        new_results.append(result)
-                        need_to_rerun = True
                     else:
-                        job.blocked_by.difference_update(newly_completed)
+                        job.blocked_by.discard(result.name)
 
+        logger.debug("Detected completion of jobs: %s", newly_completed)
+        logger.debug("Detected failed jobs: %s", failed_jobs)
         return newly_completed, canceled_jobs
 
 
@@ -359,7 +419,8 @@ class _BatchJobs:
     """Helper class to manage jobs in a batch."""
 
     def __init__(self, params):
-        self._estimated_batch_time = timedelta(seconds=0)
+        # Times are in seconds to avoid creating timedelta objects for every job.
+        self._estimated_batch_time = 0
         self._num_processes = params.num_parallel_processes_per_node
         self._per_node_batch_size = params.per_node_batch_size
         self._time_based_batching = params.time_based_batching
@@ -368,7 +429,7 @@ class _BatchJobs:
         self._job_names = set()
         self._is_ready_to_submit = False
         if self._time_based_batching:
-            self._max_batch_time = params.get_wall_time() * self._num_processes
+            self._max_batch_time = params.get_wall_time().total_seconds() * self._num_processes
         else:
             self._max_batch_time = None
 
@@ -384,19 +445,17 @@ class _BatchJobs:
         # It does assume that if time_based_batching is enabled, jobs are sorted by
         # estimated_run_minutes in ascending order. Once one job is too long, all other
         # jobs will be too long.
-        if (
-            self._time_based_batching
-            and self._estimated_batch_time + timedelta(minutes=job.estimated_run_minutes)
-            > self._max_batch_time
-        ):
-            self._is_ready_to_submit = True
-            return False
+        if self._time_based_batching:
+            job_time = job.estimated_run_minutes * 60
+            if self._estimated_batch_time + job_time > self._max_batch_time:
+                self._is_ready_to_submit = True
+                return False
 
         self._jobs.append(job)
         self._job_names.add(job.name)
 
         if self._time_based_batching:
-            self._estimated_batch_time += timedelta(minutes=job.estimated_run_minutes)
+            self._estimated_batch_time += job_time
         elif self.num_jobs >= self._per_node_batch_size:
             self._is_ready_to_submit = True
         return True
@@ -473,8 +532,7 @@ class AsyncHpcSubmitter(AsyncJobInterface):
         self._job_id = job_id
         self._output = output
         self._name = name
-        # Re-enable this if we ever keep a submitter active and polling again.
-        # self._last_status = HpcJobStatus.NONE
+        self._last_status = None
         self._is_complete = False
         self._dry_run = dry_run
         self._return_code = None
@@ -511,20 +569,22 @@ class AsyncHpcSubmitter(AsyncJobInterface):
     def is_complete(self):
         if self._is_complete:
             return self._is_complete
-        status = self._status_collector.check_status(self._job_id)
-        # if status != self._last_status:
-        logger.info("HPC job ID %s status=%s", self._job_id, status)
-        #    event = StructuredLogEvent(
-        #        source=self._name,
-        #        category=EVENT_CATEGORY_HPC,
-        #        name=EVENT_NAME_HPC_JOB_STATE_CHANGE,
-        #        message="HPC job state change",
-        #        job_id=self._job_id,
-        #        old_state=self._last_status.value,
-        #        new_state=status.value,
-        #    )
-        #    log_event(event)
-        #    self._last_status = status
+        # The owner of the status collector refreshes it before each pass over the queue.
+        status = self._status_collector.lookup(self._job_id)
+        if status != self._last_status:
+            # Only log transitions. This is called on every poll of every submitter.
+            logger.info("HPC job ID %s status=%s", self._job_id, status)
+            # event = StructuredLogEvent(
+            #     source=self._name,
+            #     category=EVENT_CATEGORY_HPC,
+            #     name=EVENT_NAME_HPC_JOB_STATE_CHANGE,
+            #     message="HPC job state change",
+            #     job_id=self._job_id,
+            #     old_state=self._last_status.value,
+            #     new_state=status.value,
+            # )
+            # log_event(event)
+            self._last_status = status
 
         self._is_complete = status in (HpcJobStatus.COMPLETE, HpcJobStatus.NONE)
         return self._is_complete
@@ -611,7 +671,7 @@ class HpcStatusCollector:
         self._statuses = {}
 
     def check_status(self, job_id):
-        """Return the status for job_id.
+        """Return the status for job_id, collecting new statuses if they are stale.
 
         Parameters
         ----------
@@ -627,14 +687,39 @@ class HpcStatusCollector:
             Raised if statuses cannot be retrieved.
 
         """
-        cur_time = time.time()
+        self.refresh_if_stale()
+        return self.lookup(job_id)
+
+    def lookup(self, job_id):
+        """Return the status for job_id from the last collection.
+
+        Parameters
+        ----------
+        job_id : str
+
+        Returns
+        -------
+        HpcJobStatus
+
+        """
+        return self._statuses.get(job_id, HpcJobStatus.NONE)
+
+    def refresh_if_stale(self):
+        """Collect new statuses if more than poll_interval seconds have elapsed since the last
+        collection.
+
+        Raises
+        ------
+        ExecutionError
+            Raised if statuses cannot be retrieved.
+
+        """
+        cur_time = time.monotonic()
         if self._last_poll_time is None or cur_time - self._last_poll_time > self._poll_interval:
             logger.debug("Collect new statuses.")
             self._statuses = self._hpc_mgr.check_statuses()
             self._last_poll_time = cur_time
 
-        return self._statuses.get(job_id, HpcJobStatus.NONE)
-
     def get_statuses(self):
         """Return outstanding statuses
 
@@ -92,20 +92,16 @@ class SlurmManager(HpcManagerInterface):
     @staticmethod
     def _get_statuses_from_output(output):
         logger.debug("squeue output:  [%s]", output)
-        lines = output.split("\n")
-        if not lines:
-            # No jobs are currently running.
-            return {}
-
+        # Parse in one pass. No output means that no jobs are currently running.
         statuses = {}
-        for line in lines:
-            if line == "":
+        status_map = SlurmManager._STATUSES
+        for line in output.splitlines():
+            fields = line.split()
+            if not fields:
                 continue
-            fields = line.strip().split()
             assert len(fields) == 2
-            job_id = fields[0]
-            status = fields[1]
-            statuses[job_id] = SlurmManager._STATUSES.get(status, HpcJobStatus.UNKNOWN)
+            job_id, status = fields
+            statuses[job_id] = status_map.get(status, HpcJobStatus.UNKNOWN)
 
         return statuses
 
@@ -37,6 +37,9 @@ class JobConfiguration(abc.ABC):
 
     FILENAME_DELIMITER = "_"
     FORMAT_VERSION = "v0.2.0"
+    # Set in configs that JADE writes for its own use. Jobs in those configs were already
+    # validated and so don't need to be validated again.
+    JOBS_VALIDATED_KEY = "jobs_validated"
 
     def __init__(
         self,
@@ -63,6 +66,7 @@ class JobConfiguration(abc.ABC):
         self._jobs = container or JobContainerByName()
         self._job_names = None
         self._jobs_directory = kwargs.get("jobs_directory")
+        self._jobs_validated = kwargs.get(self.JOBS_VALIDATED_KEY, False)
         self._registry = Registry()
         self._job_global_config = job_global_config
         self._job_post_process_config = job_post_process_config
@@ -89,10 +93,15 @@ class JobConfiguration(abc.ABC):
         """Concisely display all instance information."""
         return self.dumps()
 
+    def _deserialize_job(self, data):
+        param_class = self.job_parameters_class(data["extension"])
+        if self._jobs_validated:
+            return param_class.deserialize_trusted(data)
+        return param_class.deserialize(data)
+
     def _deserialize_jobs(self, jobs):
         for _job in jobs:
-            param_class = self.job_parameters_class(_job["extension"])
-            job = param_class.deserialize(_job)
+            job = self._deserialize_job(_job)
             self.add_job(job)
 
     def _deserialize_jobs_from_names(self, job_names):
@@ -116,8 +125,7 @@ class JobConfiguration(abc.ABC):
         filename = os.path.join(self._jobs_directory, name) + ".json"
         assert os.path.exists(filename), filename
         job = load_data(filename)
-        param_class = self.job_parameters_class(job["extension"])
-        return param_class.deserialize(job)
+        return self._deserialize_job(job)
 
     @abc.abstractmethod
     def _serialize(self, data):
@@ -643,6 +651,7 @@ class JobConfiguration(abc.ABC):
         # read its own info.
         self.serialize_jobs(scratch_dir)
         data = self.serialize(ConfigSerializeOptions.JOB_NAMES)
+        data[self.JOBS_VALIDATED_KEY] = True
         config_file = os.path.join(scratch_dir, CONFIG_FILE)
         dump_data(data, config_file, cls=ExtendedJSONEncoder)
         logger.info("Dumped config file locally to %s", config_file)
@@ -97,8 +97,13 @@ def deserialize_config(data, **kwargs):
     config_module = data["configuration_module"]
     config_class = data["configuration_class"]
     for ext in registry.iter_extensions():
-        ext_cfg_class = ext[ExtensionClassType.CONFIGURATION]
-        if ext_cfg_class.__module__ == config_module and ext_cfg_class.__name__ == config_class:
+        if (
+            ext["job_configuration_module"] == config_module
+            and ext["job_configuration_class"] == config_class
+        ):
+            ext_cfg_class = registry.get_extension_class(
+                ext["name"], ExtensionClassType.CONFIGURATION
+            )
             return ext_cfg_class.deserialize(data, **kwargs)
 
     raise InvalidParameter(f"Cannot deserialize {config_module}.{config_class}")
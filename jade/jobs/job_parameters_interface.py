@@ -67,6 +67,22 @@ class JobParametersInterface(abc.ABC):
 
         """
 
+    @classmethod
+    def deserialize_trusted(cls, data):
+        """Deserialize parameters from a dictionary that JADE created with serialize.
+        Implementations can skip validation. The default implementation calls deserialize.
+
+        Parameters
+        ----------
+        data : dict
+
+        Returns
+        -------
+        JobParametersInterface
+
+        """
+        return cls.deserialize(data)
+
     @abc.abstractmethod
     def get_blocking_jobs(self):
         """Return the job names blocking this job.
@@ -1,6 +1,6 @@
 """Defines class for managing a job queue."""
 
-from collections import OrderedDict
+from collections import OrderedDict, defaultdict
 import logging
 import os
 import time
@@ -54,6 +54,9 @@ class JobQueue:
         self._poll_interval = poll_interval
         self._outstanding_jobs = OrderedDict()
         self._queued_jobs = []
+        # Queued jobs indexed by the names of the jobs blocking them. A completion only has
+        # to visit the jobs that it blocks instead of every queued job.
+        self._queued_jobs_by_blocking_job = defaultdict(list)
         self._num_jobs = 0
         self._num_completed = 0
         self._monitor_func = monitor_func
@@ -95,29 +98,36 @@ class JobQueue:
 
             self._num_completed += len(completed_jobs)
             logger.debug("found num_completed=%s", len(completed_jobs))
+            canceled_jobs = set()
             for name in completed_jobs:
                 self._outstanding_jobs.pop(name)
                 logger.debug("Completed a job %s", name)
 
-                canceled_indices = []
-                for i, job in enumerate(self._queued_jobs):
+                for job in self._queued_jobs_by_blocking_job.pop(name, []):
                     blocking_jobs = job.get_blocking_jobs()
-                    if blocking_jobs:
-                        if job.cancel_on_blocking_job_failure and blocking_jobs.intersection(
-                            failed_jobs
-                        ):
-                            job.set_blocking_jobs(set())
-                            job.cancel()
-                            canceled_indices.append(i)
-                            self._num_jobs += 1
-                            self._outstanding_jobs[job.name] = job
-                            need_to_rerun = True
-                        elif name in blocking_jobs:
-                            logger.debug("Remove %s from job=%s blocked list", name, job.name)
-                            job.remove_blocking_job(name)
-
-                for index in reversed(canceled_indices):
-                    self._queued_jobs.pop(index)
+                    if name not in blocking_jobs:
+                        # The job was canceled.
+                        continue
+                    if job.cancel_on_blocking_job_failure and blocking_jobs.intersection(
+                        failed_jobs
+                    ):
+                        job.set_blocking_jobs(set())
+                        job.cancel()
+                        canceled_jobs.add(job.name)
+                        self._num_jobs += 1
+                        self._outstanding_jobs[job.name] = job
+                        need_to_rerun = True
+                    else:
+                        logger.debug("Remove %s from job=%s blocked list", name, job.name)
+                        job.remove_blocking_job(name)
+
+            if canceled_jobs:
+                self._queued_jobs = [x for x in self._queued_jobs if x.name not in canceled_jobs]
+
+    def _queue_job(self, job):
+        self._queued_jobs.append(job)
+        for name in job.get_blocking_jobs():
+            self._queued_jobs_by_blocking_job[name].append(job)
 
     def _run_job(self, job):
         logger.debug("Run job %s", job.name)
@@ -227,10 +237,10 @@ class JobQueue:
         """
         if self.is_full():
             logger.debug("queue depth exceeded, queue job %s", job.name)
-            self._queued_jobs.append(job)
+            self._queue_job(job)
         elif job.get_blocking_jobs():
             logger.debug("Job is blocked by %s", job.get_blocking_jobs())
-            self._queued_jobs.append(job)
+            self._queue_job(job)
         else:
             self._run_job(job)
             logger.debug("Started job %s in submit", job.name)
@@ -29,7 +29,7 @@ from jade.events import (
     EVENT_NAME_SUBMIT_COMPLETED,
 )
 from jade.exceptions import InvalidParameter
-from jade.extensions.registry import Registry, ExtensionClassType
+from jade.extensions.registry import Registry
 from jade.hpc.common import HpcType
 from jade.hpc.hpc_manager import HpcManager
 from jade.hpc.hpc_submitter import HpcSubmitter
@@ -300,8 +300,7 @@ results_summary={self.get_results_summmary_report()}"""
         extensions = registry.list_extensions()
         extension_packages = set(["jade"])
         for ext in extensions:
-            exec_module = ext[ExtensionClassType.EXECUTION].__module__
-            name = exec_module.split(".")[0]
+            name = ext["job_execution_module"].split(".")[0]
             extension_packages.add(name)
 
         for name in extension_packages:
@@ -315,7 +315,17 @@ class ResultsAggregator:
 
     def _get_node_results_files(self):
         assert not self._is_node
-        return list((self._filename.parent / RESULTS_DIR).glob("results_batch_*.csv"))
+        # This runs on every submitter pass, often on a shared filesystem. scandir returns the
+        # names without the per-entry pattern matching and Path construction done by glob.
+        try:
+            with os.scandir(self._filename.parent / RESULTS_DIR) as entries:
+                return [
+                    Path(entry.path)
+                    for entry in entries
+                    if entry.name.startswith("results_batch_") and entry.name.endswith(".csv")
+                ]
+        except FileNotFoundError:
+            return []
 
     def _process_results(self):
         results = []
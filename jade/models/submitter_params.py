@@ -1,5 +1,6 @@
 """Models for submitter options"""
 
+import functools
 import re
 from datetime import timedelta
 from typing import Optional
@@ -144,7 +145,9 @@ class SubmitterParams(JadeBaseModel):
 _REGEX_WALL_TIME = re.compile(r"(\d+):(\d+):(\d+)")
 
 
+@functools.lru_cache(maxsize=32)
 def _to_timedelta(wall_time):
+    # Called for every time-based batch. A run only has a few distinct wall times.
     match = _REGEX_WALL_TIME.search(wall_time)
     assert match
     hours = int(match.group(1))
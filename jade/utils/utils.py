@@ -21,6 +21,11 @@ from pydantic.v1 import BaseModel
 from jade.exceptions import InvalidParameter
 from jade.utils.timing_utils import timed_debug
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 MAX_PATH_LENGTH = 255
 
@@ -149,12 +154,25 @@ def load_data(filename, **kwargs):
     # TODO:  YAMLLoadWarning: calling yaml.load() without Loader=... is deprecated,
     #  as the default Loader is unsafe. Please read https://msg.pyyaml.org/load for full details.
     mod = _get_module_from_extension(filename, **kwargs)
-    with open(filename) as f_in:
+    if mod is json and orjson is not None and not kwargs:
+        with open(filename, "rb") as f_in:
+            text = f_in.read()
         try:
-            data = mod.load(f_in)
-        except Exception:
-            logger.exception(f"Failed to load {filename}")
-            raise
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            # orjson is stricter than json, such as with NaN values.
+            try:
+                data = json.loads(text)
+            except Exception:
+                logger.exception(f"Failed to load {filename}")
+                raise
+    else:
+        with open(filename) as f_in:
+            try:
+                data = mod.load(f_in)
+            except Exception:
+                logger.exception(f"Failed to load {filename}")
+                raise
 
     logger.debug("Loaded data from %s", filename)
     return data
@@ -105,6 +105,19 @@ def test_generic_command_parameters():
     assert next(iter(job.blocked_by)) == "1"
 
 
+def test_generic_command_parameters_deserialize_trusted():
+    job = GenericCommandParameters(command="bash myscript.sh", job_id=2, blocked_by=[1])
+    job.append_job_name = True
+    data = job.serialize()
+    job2 = GenericCommandParameters.deserialize_trusted(data)
+    assert job2.serialize() == data
+    assert job2.blocked_by == {"1"}
+    assert job2.append_job_name
+    assert job2.name == "2"
+    job2.blocked_by.add("3")
+    assert job.blocked_by == {"1"}
+
+
 def test_sorted_order(generic_command_fixture):
     with open(TEST_FILENAME, "w") as f_out:
         pass
@@ -80,7 +80,7 @@ def test_registry__reset_defaults(registry_fixture):
     clear_extensions(registry)
     registry.reset_defaults()
     assert len(registry.list_extensions()) == len(DEFAULT_REGISTRY["extensions"])
-    assert registry.list_loggers() == DEFAULT_REGISTRY["logging"]
+    assert registry.list_loggers() == list(DEFAULT_REGISTRY["logging"])
 
 
 def test_registry__add_logger(registry_fixture):
@@ -101,3 +101,33 @@ def test_registry__show_extensions(capsys, registry_fixture):
     captured = capsys.readouterr()
     for extension in DEFAULT_REGISTRY["extensions"]:
         assert extension["name"] in captured.out
+
+
+def test_registry__lazy_extension_classes(registry_fixture):
+    registry = Registry(registry_filename=TEST_FILENAME)
+    registry.reset_defaults()
+    registry = Registry(registry_filename=TEST_FILENAME)
+    name = DEFAULT_REGISTRY["extensions"][0]["name"]
+    classes = registry._extension_classes[name]
+    assert ExtensionClassType.CONFIGURATION not in classes
+    cfg_class = registry.get_extension_class(name, ExtensionClassType.CONFIGURATION)
+    assert cfg_class == GenericCommandConfiguration
+    assert classes[ExtensionClassType.CONFIGURATION] is cfg_class
+    assert ExtensionClassType.EXECUTION not in classes
+    ext = registry.list_extensions()[0]
+    assert not any(isinstance(key, ExtensionClassType) for key in ext)
+
+
+@pytest.mark.parametrize(
+    "field, value",
+    [("job_execution_module", "jade.not_a_module"), ("job_execution_class", "NotAClass")],
+)
+def test_registry__register_invalid_extension(registry_fixture, field, value):
+    registry = Registry(registry_filename=TEST_FILENAME)
+    registry.reset_defaults()
+    extension = {**DEFAULT_REGISTRY["extensions"][0], "name": "invalid", field: value}
+    with pytest.raises((ImportError, AttributeError)):
+        registry.register_extension(extension)
+    assert not registry.is_registered("invalid")
+    registry.add_logger("test-package")
+    assert not Registry(registry_filename=TEST_FILENAME).is_registered("invalid")
@@ -105,6 +105,55 @@ def test_job_queue__run_jobs_ordering():
     assert jobs["3"].start_time > jobs["5"].end_time
 
 
+class FailingJob(FakeJob):
+    @property
+    def return_code(self):
+        assert self.is_complete()
+        return 1
+
+
+class CancelableFakeJob(FakeJob):
+    def __init__(self, name, duration, blocking_jobs=None):
+        super().__init__(name, duration, blocking_jobs=blocking_jobs)
+        self.canceled = False
+
+    def cancel(self):
+        self.canceled = True
+        super().cancel()
+
+    @property
+    def cancel_on_blocking_job_failure(self):
+        return True
+
+    @property
+    def return_code(self):
+        assert self.is_complete()
+        return 1 if self.canceled else 0
+
+    def set_blocking_jobs(self, jobs):
+        self._blocking_jobs = jobs
+
+
+def test_job_queue__cancel_on_blocking_job_failure():
+    duration = 0.1
+    jobs = [
+        FailingJob("1", duration),
+        CancelableFakeJob("2", duration, blocking_jobs={"1"}),
+        CancelableFakeJob("3", duration, blocking_jobs={"2"}),
+        CancelableFakeJob("4", duration, blocking_jobs={"5"}),
+        FakeJob("5", duration),
+    ]
+    JobQueue.run_jobs(jobs, 5, poll_interval=0.1)
+
+    for job in jobs:
+        assert job.is_complete()
+        assert not job.get_blocking_jobs()
+    assert jobs[1].canceled
+    assert jobs[2].canceled
+    assert not jobs[3].canceled
+    assert jobs[3].start_time > jobs[4].end_time
+
+
 def test_job_queue__monitor_func():
     has_run = []
 
@@ -2,6 +2,7 @@ from pathlib import Path
 
 import pytest
 
+from jade.common import RESULTS_DB_FILE, STATS_SUMMARY_FILE
 from jade.jobs.job_submitter import JobSubmitter
 
 
@@ -23,7 +24,13 @@ def test_jobs_submitter__find_error_log_messages(example_output):
 @pytest.fixture
 def cleanup(example_output):
     def delete_files():
-        for filename in ("errors.txt", "results.txt", "stats.txt"):
+        for filename in (
+            "errors.txt",
+            "results.txt",
+            "stats.txt",
+            RESULTS_DB_FILE,
+            STATS_SUMMARY_FILE,
+        ):
             path = Path(example_output) / filename
             if path.exists():
                 path.unlink()
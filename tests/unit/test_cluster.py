@@ -73,6 +73,17 @@ def test_cluster__submit_jobs(cluster):
     assert cluster.job_status.version == 2
 
 
+def test_cluster__complete_jobs(cluster):
+    jobs = cluster.job_status.jobs
+    cluster.update_job_status(jobs, [], set(), [], [1], 1)
+    assert not cluster.are_all_jobs_complete()
+    cluster.update_job_status([], [], set(), [jobs[0].name], [1], 1)
+    assert not cluster.are_all_jobs_complete()
+    cluster.update_job_status([], [], set(), [jobs[1].name], [], 1)
+    assert cluster.config.completed_jobs == 2
+    assert cluster.are_all_jobs_complete()
+
+
 def test_cluster__version_mismatch(cluster):
     cluster.demote_from_submitter()
     assert not cluster.am_i_submitter()
@@ -1,5 +1,7 @@
 import mock
 import pytest
+from jade.common import RESULTS_DIR
+from jade.jobs.results_aggregator import ResultsAggregator
 from jade.result import *
 
 
@@ -170,3 +172,17 @@ def test_deserialize_results(jade_data, jade_results):
 #    captured = capsys.readouterr()
 #    assert "deployment__result__2" in captured.out
 #    assert "deployment__result__1" not in captured.out
+
+
+def test_results_aggregator__process_results(tmp_path):
+    """Should collect per-node results and tolerate a missing results directory"""
+    agg = ResultsAggregator.create(tmp_path)
+    assert agg.process_results() == []
+    result = Result("job1", 0, "finished", 10, 15555555555, "1")
+    (tmp_path / RESULTS_DIR).mkdir()
+    node_agg = ResultsAggregator.load_node_results(tmp_path, 1)
+    node_agg.create_files()
+    ResultsAggregator.append(tmp_path, result, batch_id=1)
+    assert agg.process_results() == [result]
+    assert not list((tmp_path / RESULTS_DIR).glob("results_batch_*.csv"))
+    assert agg.get_results() == [result]
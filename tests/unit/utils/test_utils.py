@@ -1,8 +1,10 @@
 """
 Unit tests for utility functions
 """
+import math
 import stat
 import tempfile
+from pathlib import Path
 
 from mock import patch
 import pytest
@@ -126,6 +128,58 @@ def test_data_dump_and_load():
     #    os.remove(yaml_file)
 
 
+@mark.parametrize("use_orjson", [True, False])
+def test_data_dump_and_load__extended_json_encoder(use_orjson, monkeypatch):
+    """Should produce the same data with or without orjson"""
+    if use_orjson and orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr("jade.utils.utils.orjson", None)
+    raw_data = {
+        "path": Path("/tmp/data"),
+        "set": {"a"},
+        "timestamp": datetime(2021, 1, 1, 12),
+        "int_key": {1: 2},
+        "large_int": 2**70,
+    }
+    expected = {
+        "path": "/tmp/data",
+        "set": ["a"],
+        "timestamp": "2021-01-01T12:00:00.000000",
+        "int_key": {"1": 2},
+        "large_int": 2**70,
+    }
+    json_file = os.path.join(tempfile.gettempdir(), "jade-unit-test-file.json")
+    try:
+        for indent in (None, 2, 4):
+            dump_data(raw_data, json_file, cls=ExtendedJSONEncoder, indent=indent)
+            assert load_data(json_file) == expected
+    finally:
+        if os.path.exists(json_file):
+            os.remove(json_file)
+
+
+@mark.parametrize("use_orjson", [True, False])
+def test_load_data__non_finite_floats(use_orjson, monkeypatch):
+    """Should load NaN and Infinity with or without orjson"""
+    if use_orjson and orjson is None:
+        pytest.skip("orjson is not installed")
+    if not use_orjson:
+        monkeypatch.setattr("jade.utils.utils.orjson", None)
+    raw_data = {"a": float("nan"), "b": float("inf"), "c": float("-inf"), "d": None}
+    json_file = os.path.join(tempfile.gettempdir(), "jade-unit-test-file.json")
+    try:
+        dump_data(raw_data, json_file)
+        data = load_data(json_file)
+        assert math.isnan(data["a"])
+        assert data["b"] == float("inf")
+        assert data["c"] == float("-inf")
+        assert data["d"] is None
+    finally:
+        if os.path.exists(json_file):
+            os.remove(json_file)
+
+
 def test_aggregate_data_from_files():
     """Should aggregate data as expected"""
     tmpdir = os.path.join(tempfile.gettempdir(), "jade-test-tmp87alkj8ew")